@@ -1,25 +1,89 @@
 """
 Main agent module containing core decision-making logic and tool orchestration.
 """
+import asyncio
+import collections
 import concurrent.futures
+import functools
 import json
 import openai
 from typing import Dict, List, Any
+
+try:
+    import orjson
+except ImportError:  # optional C-accelerated JSON
+    orjson = None
+
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:  # optional libuv-backed event loop
+    uvloop = None
+
 from .tools import WebScraper, CalendarTool
 from .preprocessing import clean_query, validate_parameters, preprocess_for_embedding
-from .approval import ApprovalManager, call_tool_with_approval
+from .approval import ApprovalManager, call_tool_with_approval, acall_tool_with_approval
 from .rag_config import load_rag_model_config, load_vector_db_config, choose_rag_model, choose_vector_db
 
+def _json_loads(data):
+    """Parse JSON bytes with orjson when available."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+@functools.lru_cache(maxsize=None)
+def _load_config_cached(config_path: str) -> Dict:
+    """Load and cache a JSON configuration file, parsed once per path."""
+    with open(config_path, 'rb') as f:
+        return _json_loads(f.read())
+
+@functools.lru_cache(maxsize=4096)
+def _openai_complete(model_name: str, prompt: str, temperature: float,
+                     max_tokens: int, top_p: float, frequency_penalty: float,
+                     presence_penalty: float) -> str:
+    """Completion call memoized on the full signature: identical
+    (model, prompt, params) tuples skip the network round trip."""
+    response = openai.Completion.create(
+        model=model_name,
+        prompt=prompt,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        top_p=top_p,
+        frequency_penalty=frequency_penalty,
+        presence_penalty=presence_penalty
+    )
+    return response.choices[0].text.strip()
+
 class Agent:
     def __init__(self, config_path: str = "config/agent_config.json"):
-        # Load all configurations
-        self.config = self._load_config("config/agent_config.json")
-        self.model_config = self._load_config("config/model_config.json")
-        self.tools_config = self._load_config("config/tool_config.json")
-        self.keys_config = self._load_config("config/keys_config.json")
-        self.rag_config = load_rag_model_config()
-        self.vector_db_config = load_vector_db_config()
-        
+        # Load all configurations concurrently - the four JSON reads and
+        # the RAG/vector-DB loads are independent file I/O
+        with concurrent.futures.ThreadPoolExecutor(max_workers=6) as executor:
+            config_future = executor.submit(self._load_config, "config/agent_config.json")
+            model_future = executor.submit(self._load_config, "config/model_config.json")
+            tools_future = executor.submit(self._load_config, "config/tool_config.json")
+            keys_future = executor.submit(self._load_config, "config/keys_config.json")
+            rag_future = executor.submit(load_rag_model_config)
+            vector_db_future = executor.submit(load_vector_db_config)
+
+            self.config = config_future.result()
+            self.model_config = model_future.result()
+            self.tools_config = tools_future.result()
+            self.keys_config = keys_future.result()
+            self.rag_config = rag_future.result()
+            self.vector_db_config = vector_db_future.result()
+
+        # Precompute per-model OpenAI call parameters once so the hot
+        # path is a single dict lookup
+        self._model_params = {
+            name: {
+                "temperature": model["temperature"],
+                "max_tokens": model["max_tokens"],
+                "top_p": model["top_p"],
+                "frequency_penalty": model["frequency_penalty"],
+                "presence_penalty": model["presence_penalty"]
+            }
+            for name, model in self.model_config["models"].items()
+        }
+
         # Initialize components
         self.approval_manager = ApprovalManager()
         self.tools = self._initialize_tools()
@@ -31,13 +95,26 @@ class Agent:
         
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from JSON file."""
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        return _load_config_cached(config_path)
             
     def _setup_openai(self):
         """Configure OpenAI API."""
         openai.api_key = self.keys_config['openai']['api_keys']['normal']
-            
+        # Built lazily: AsyncOpenAI only exists in openai>=1.0, and the
+        # sync paths still run on the legacy Completion API
+        self._aclient = None
+
+    def _get_aclient(self):
+        """Return the async OpenAI client, constructing it on first use."""
+        if self._aclient is None:
+            if not hasattr(openai, "AsyncOpenAI"):
+                raise RuntimeError(
+                    "Async agent tasks require openai>=1.0 (openai.AsyncOpenAI)"
+                )
+            self._aclient = openai.AsyncOpenAI(api_key=openai.api_key)
+        return self._aclient
+
+
     def _initialize_tools(self) -> Dict:
         """Initialize all required tools based on configuration."""
         return {
@@ -62,32 +139,86 @@ class Agent:
             return None
             
     def choose_model(self, model_name: str) -> Dict:
-        """Select the model and return its parameters."""
-        model = self.model_config["models"].get(model_name, None)
-        if model:
-            return model
+        """Select the model and return its precomputed call parameters."""
+        params = self._model_params.get(model_name)
+        if params:
+            return params
         raise ValueError(f"Model {model_name} not found in configuration.")
         
+    # Keep batches under the per-model tokens-per-minute budget
+    MAX_BATCH_TOKENS = 250000
+
+    def _dispatch_model_batch(self, model_name: str, tasks: List[Dict]) -> List[str]:
+        """Run all model tasks sharing a model through batched completion calls."""
+        model = self.choose_model(model_name)
+        prompts = [task["prompt"] for task in tasks]
+
+        # Cap batch size so prompts * max_tokens stays within the token budget
+        batch_size = max(1, self.MAX_BATCH_TOKENS // max(1, model["max_tokens"]))
+
+        texts = []
+        for start in range(0, len(prompts), batch_size):
+            response = openai.Completion.create(
+                model=model_name,
+                prompt=prompts[start:start + batch_size],
+                **model
+            )
+            choices = sorted(response.choices, key=lambda choice: choice.index)
+            texts.extend(choice.text.strip() for choice in choices)
+        return texts
+
     def call_openai_model(self, model_name: str, prompt: str) -> str:
         """Call OpenAI's API with the selected model and its parameters."""
         model = self.choose_model(model_name)
-        response = openai.Completion.create(
+        return _openai_complete(
+            model_name,
+            prompt,
+            model["temperature"],
+            model["max_tokens"],
+            model["top_p"],
+            model["frequency_penalty"],
+            model["presence_penalty"]
+        )
+        
+    async def acall_openai_model(self, model_name: str, prompt: str) -> str:
+        """Call OpenAI's API asynchronously with the selected model."""
+        model = self.choose_model(model_name)
+        response = await self._get_aclient().completions.create(
             model=model_name,
             prompt=prompt,
-            temperature=model["temperature"],
-            max_tokens=model["max_tokens"],
-            top_p=model["top_p"],
-            frequency_penalty=model["frequency_penalty"],
-            presence_penalty=model["presence_penalty"]
+            **model
         )
         return response.choices[0].text.strip()
-        
+
+    async def arun_agent_task(self, task: Dict) -> Any:
+        """Run a specific agent task asynchronously."""
+        # Clean and validate task parameters
+        if 'params' in task:
+            task['params'] = validate_parameters(task['params'])
+
+        if task.get("is_model_task"):
+            return await self.acall_openai_model(
+                task["model_name"],
+                task["prompt"]
+            )
+        else:
+            # Approvals queue up on one consolidated prompt; the tool
+            # itself runs off-loop inside acall_tool_with_approval
+            return await acall_tool_with_approval(
+                task["tool"],
+                task["params"]
+            )
+
+    async def arun_agents_parallel(self, tasks: List[Dict]) -> List[Any]:
+        """Run agent tasks concurrently on the event loop."""
+        return await asyncio.gather(
+            *[self.arun_agent_task(task) for task in tasks]
+        )
+
     def run_agents_parallel(self, tasks: List[Dict]) -> List[Any]:
         """Run agents in parallel."""
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            results = list(executor.map(self.run_agent_task, tasks))
-        return results
-        
+        return asyncio.run(self.arun_agents_parallel(tasks))
+
     def run_agent_task(self, task: Dict) -> Any:
         """Run a specific agent task."""
         # Clean and validate task parameters
@@ -111,10 +242,47 @@ class Agent:
         for task in tasks:
             if 'query' in task:
                 task['query'] = clean_query(task['query'])
-            if task.get('needs_embedding'):
-                task['text'] = preprocess_for_embedding(task['text'])
-                
-        return self.run_agents_parallel(tasks)
+
+        # Preprocess every embedding text in one batched call, then
+        # scatter the cleaned texts back to their task slots
+        embed_indices = [
+            i for i, task in enumerate(tasks) if task.get('needs_embedding')
+        ]
+        if embed_indices:
+            cleaned = preprocess_for_embedding(
+                [tasks[i]['text'] for i in embed_indices]
+            )
+            for i, text in zip(embed_indices, cleaned):
+                tasks[i]['text'] = text
+
+        # Group model tasks by model so each group is one batched API call
+        results = [None] * len(tasks)
+        model_groups = collections.defaultdict(list)
+        tool_indices = []
+        for i, task in enumerate(tasks):
+            if task.get("is_model_task"):
+                model_groups[task["model_name"]].append(i)
+            else:
+                tool_indices.append(i)
+
+        with concurrent.futures.ThreadPoolExecutor() as executor:
+            batch_futures = {
+                executor.submit(
+                    self._dispatch_model_batch, name, [tasks[i] for i in indices]
+                ): indices
+                for name, indices in model_groups.items()
+            }
+            tool_futures = {
+                executor.submit(self.run_agent_task, tasks[i]): i
+                for i in tool_indices
+            }
+            for future, indices in batch_futures.items():
+                for i, text in zip(indices, future.result()):
+                    results[i] = text
+            for future, i in tool_futures.items():
+                results[i] = future.result()
+
+        return results
 
 def main():
     """Main function to run the agent system."""
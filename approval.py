@@ -1,12 +1,33 @@
 """
 Module for handling tool approval requirements and validation.
 """
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Optional, Union, Tuple, List
+import asyncio
+import functools
+import hashlib
 import json
+import threading
+import time
 from dataclasses import dataclass
 from enum import Enum, auto
+
+try:
+    import orjson
+except ImportError:  # optional C-accelerated JSON
+    orjson = None
+
 from .tools import scrape_website, fetch_calendar_events
 
+def _json_loads(data):
+    """Parse JSON bytes with orjson when available."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+@functools.lru_cache(maxsize=None)
+def _load_config_cached(config_path: str) -> Dict[str, Any]:
+    """Load and cache a JSON configuration file, parsed once per path."""
+    with open(config_path, 'rb') as f:
+        return _json_loads(f.read())
+
 class ApprovalStatus(Enum):
     """Enum for approval status."""
     PENDING = auto()
@@ -21,18 +42,57 @@ class ApprovalRequest:
     description: str
     status: ApprovalStatus = ApprovalStatus.PENDING
 
+# O(1) hash dispatch for tool execution instead of an if/elif chain
+_TOOL_DISPATCH = {
+    "scrape_website": scrape_website,
+    "fetch_calendar_events": fetch_calendar_events
+}
+
+# Maps config type names onto the Python types they validate against
+_PARAM_TYPES = {"string": str, "integer": int}
+
+_MISSING = object()
+
 class ApprovalManager:
     """Manages tool approvals and parameter validation."""
-    
+
     def __init__(self, config_path: str = "config/tool_config.json"):
         """Initialize the approval manager with tool configurations."""
         self.tool_config = self._load_config(config_path)
         self.pending_approvals: Dict[str, ApprovalRequest] = {}
+        # Compile each tool's expected params into (name, type) pairs
+        # once so validation doesn't re-branch on type strings per call
+        self._validators = {
+            tool_name: tuple(
+                (param_name, _PARAM_TYPES.get(param_type, object))
+                for param_name, param_type in tool_info.get("params", {}).items()
+            )
+            for tool_name, tool_info in self.tool_config["tools"].items()
+        }
+        # Remember recent approvals so identical requests in a batch
+        # don't re-prompt the user; rejections always re-prompt
+        self._decisions: Dict[Tuple[str, str], Tuple[ApprovalStatus, float]] = {}
+        self._decision_ttl = 300.0
+        self._decision_lock = threading.Lock()
+        # Queue feeding the single prompt loop for async approvals;
+        # rebuilt whenever the running event loop changes, since
+        # asyncio.run tears the consumer task down on every return
+        self._approval_queue: Optional[asyncio.Queue] = None
+        self._prompt_task: Optional[asyncio.Task] = None
+        self._prompt_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _decision_key(self, tool_name: str, params: Dict[str, Any]) -> Tuple[str, str]:
+        """Build a cache key from the tool name and canonicalized params."""
+        if orjson is not None:
+            payload = orjson.dumps(params, option=orjson.OPT_SORT_KEYS)
+        else:
+            payload = json.dumps(params, sort_keys=True).encode()
+        digest = hashlib.blake2b(payload).hexdigest()
+        return (tool_name, digest)
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load tool configuration from JSON file."""
-        with open(config_path, 'r') as f:
-            return json.load(f)
+        return _load_config_cached(config_path)
             
     def is_approval_required(self, tool_name: str) -> bool:
         """Check if a tool requires approval."""
@@ -52,23 +112,16 @@ class ApprovalManager:
         Returns:
             True if parameters are valid, False otherwise
         """
-        tool_info = self.tool_config["tools"].get(tool_name)
-        if not tool_info:
+        checks = self._validators.get(tool_name)
+        if checks is None:
             raise ValueError(f"Tool {tool_name} not found in configuration")
-            
-        expected_params = tool_info.get("params", {})
-        
-        # Check all required parameters are present
-        for param_name, param_type in expected_params.items():
-            if param_name not in params:
-                return False
-            
-            # Validate parameter type
-            if param_type == "string" and not isinstance(params[param_name], str):
-                return False
-            elif param_type == "integer" and not isinstance(params[param_name], int):
+
+        # Check presence and type against the precompiled pairs
+        for param_name, param_type in checks:
+            value = params.get(param_name, _MISSING)
+            if value is _MISSING or not isinstance(value, param_type):
                 return False
-                
+
         return True
         
     def get_user_approval(self, request: ApprovalRequest) -> bool:
@@ -109,23 +162,160 @@ class ApprovalManager:
         # Validate parameters before creating request
         if not self.validate_params(tool_name, params):
             raise ValueError(f"Invalid parameters for tool {tool_name}")
-            
+
+        # Reuse a recent approval for the same tool and params
+        key = self._decision_key(tool_name, params)
+        with self._decision_lock:
+            cached = self._decisions.get(key)
+            if cached:
+                status, expires_at = cached
+                if status is ApprovalStatus.APPROVED and time.monotonic() < expires_at:
+                    request = ApprovalRequest(
+                        tool_name=tool_name,
+                        params=params,
+                        description=tool_info["description"],
+                        status=status
+                    )
+                    self.pending_approvals[tool_name] = request
+                    return request
+                del self._decisions[key]
+
         request = ApprovalRequest(
             tool_name=tool_name,
             params=params,
             description=tool_info["description"]
         )
-        
+
         self.pending_approvals[tool_name] = request
-        
+
         # Get user approval immediately
         if self.get_user_approval(request):
             self.approve_request(tool_name)
         else:
             self.reject_request(tool_name)
-            
+
+        # Only approvals are reusable; a rejection must re-prompt next time
+        if request.status is ApprovalStatus.APPROVED:
+            with self._decision_lock:
+                self._decisions[key] = (
+                    request.status,
+                    time.monotonic() + self._decision_ttl
+                )
+
         return request
         
+    async def arequest_approval(self, tool_name: str, params: Dict[str, Any]) -> ApprovalRequest:
+        """
+        Request approval asynchronously via the consolidated prompt queue.
+
+        Args:
+            tool_name: Name of the tool
+            params: Tool parameters
+
+        Returns:
+            ApprovalRequest object with its resolved status
+        """
+        tool_info = self.tool_config["tools"].get(tool_name)
+        if not tool_info:
+            raise ValueError(f"Tool {tool_name} not found in configuration")
+
+        if not self.validate_params(tool_name, params):
+            raise ValueError(f"Invalid parameters for tool {tool_name}")
+
+        # Reuse a recent approval for the same tool and params
+        key = self._decision_key(tool_name, params)
+        with self._decision_lock:
+            cached = self._decisions.get(key)
+            if cached:
+                status, expires_at = cached
+                if status is ApprovalStatus.APPROVED and time.monotonic() < expires_at:
+                    request = ApprovalRequest(
+                        tool_name=tool_name,
+                        params=params,
+                        description=tool_info["description"],
+                        status=status
+                    )
+                    self.pending_approvals[tool_name] = request
+                    return request
+                del self._decisions[key]
+
+        request = ApprovalRequest(
+            tool_name=tool_name,
+            params=params,
+            description=tool_info["description"]
+        )
+        self.pending_approvals[tool_name] = request
+
+        # Start the prompt loop lazily on the running event loop; a dead
+        # consumer or one bound to a previous loop must be recreated or
+        # queued futures would never resolve
+        loop = asyncio.get_running_loop()
+        if (self._approval_queue is None
+                or self._prompt_task is None
+                or self._prompt_task.done()
+                or self._prompt_loop is not loop):
+            self._approval_queue = asyncio.Queue()
+            self._prompt_loop = loop
+            self._prompt_task = asyncio.create_task(self._approval_prompt_loop())
+
+        future = loop.create_future()
+        await self._approval_queue.put((request, future))
+        await future
+
+        # Only approvals are reusable; a rejection must re-prompt next time
+        if request.status is ApprovalStatus.APPROVED:
+            with self._decision_lock:
+                self._decisions[key] = (
+                    request.status,
+                    time.monotonic() + self._decision_ttl
+                )
+
+        return request
+
+    async def _approval_prompt_loop(self) -> None:
+        """Drain queued approval requests and prompt the user once per batch."""
+        while True:
+            # Block for the first request, then grab everything queued
+            # behind it so the whole batch gets one consolidated prompt
+            batch = [await self._approval_queue.get()]
+            while not self._approval_queue.empty():
+                batch.append(self._approval_queue.get_nowait())
+
+            # A failed prompt (e.g. EOFError when stdin is closed in a
+            # non-interactive deployment) must still resolve every queued
+            # future, or their arequest_approval callers await forever
+            try:
+                approved = await asyncio.to_thread(
+                    self._prompt_for_batch, [request for request, _ in batch]
+                )
+            except Exception as e:
+                for request, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for request, future in batch:
+                request.status = (
+                    ApprovalStatus.APPROVED if approved else ApprovalStatus.REJECTED
+                )
+                # A waiter cancelled mid-prompt must not kill the loop
+                # for the rest of the batch
+                if not future.done():
+                    future.set_result(request.status)
+
+    def _prompt_for_batch(self, requests: List[ApprovalRequest]) -> bool:
+        """Present a consolidated approval prompt for a batch of requests."""
+        print(f"\n{len(requests)} tool call(s) require approval:")
+        for request in requests:
+            print(f"  - {request.tool_name}: {request.description}")
+            print(f"    Parameters: {request.params}")
+
+        while True:
+            approval = input(f"\nApprove all {len(requests)} call(s)? (y/n): ").lower()
+            if approval in ['y', 'n']:
+                return approval == 'y'
+            print("Please enter 'y' for yes or 'n' for no.")
+
     def approve_request(self, tool_name: str) -> None:
         """Approve a pending tool request."""
         request = self.pending_approvals.get(tool_name)
@@ -145,19 +335,36 @@ class ApprovalManager:
         request = self.pending_approvals.get(tool_name)
         return request.status if request else None
 
-def call_tool_with_approval(tool_name: str, params: Dict[str, Any]) -> Any:
+# Shared ApprovalManager so tool config is parsed once per process
+_approval_manager: Optional[ApprovalManager] = None
+_approval_manager_lock = threading.Lock()
+
+def _get_approval_manager() -> ApprovalManager:
+    """Return the shared ApprovalManager, constructing it on first use."""
+    global _approval_manager
+    if _approval_manager is None:
+        with _approval_manager_lock:
+            if _approval_manager is None:
+                _approval_manager = ApprovalManager()
+    return _approval_manager
+
+def call_tool_with_approval(tool_name: str,
+                            params: Dict[str, Any],
+                            approval_manager: Optional[ApprovalManager] = None) -> Any:
     """
     Call a tool with approval handling.
-    
+
     Args:
         tool_name: Name of the tool to call
         params: Parameters for the tool
-        
+        approval_manager: Optional manager to use instead of the shared one
+
     Returns:
         Tool execution result or error message
     """
-    approval_manager = ApprovalManager()
-    
+    if approval_manager is None:
+        approval_manager = _get_approval_manager()
+
     if approval_manager.is_approval_required(tool_name):
         request = approval_manager.request_approval(tool_name, params)
         if request.status != ApprovalStatus.APPROVED:
@@ -165,13 +372,44 @@ def call_tool_with_approval(tool_name: str, params: Dict[str, Any]) -> Any:
     
     # Execute the approved tool
     try:
-        if tool_name == "scrape_website":
-            result = scrape_website(**params)
-        elif tool_name == "fetch_calendar_events":
-            result = fetch_calendar_events(**params)
-        else:
+        tool_fn = _TOOL_DISPATCH.get(tool_name)
+        if tool_fn is None:
             raise ValueError(f"Unknown tool: {tool_name}")
-            
+
+        result = tool_fn(**params)
+        return {"status": "success", "result": result}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+async def acall_tool_with_approval(tool_name: str,
+                                   params: Dict[str, Any],
+                                   approval_manager: Optional[ApprovalManager] = None) -> Any:
+    """
+    Async variant of call_tool_with_approval using the prompt queue.
+
+    Args:
+        tool_name: Name of the tool to call
+        params: Parameters for the tool
+        approval_manager: Optional manager to use instead of the shared one
+
+    Returns:
+        Tool execution result or error message
+    """
+    if approval_manager is None:
+        approval_manager = _get_approval_manager()
+
+    if approval_manager.is_approval_required(tool_name):
+        request = await approval_manager.arequest_approval(tool_name, params)
+        if request.status != ApprovalStatus.APPROVED:
+            return {"status": "error", "message": f"Tool {tool_name} was not approved"}
+
+    try:
+        tool_fn = _TOOL_DISPATCH.get(tool_name)
+        if tool_fn is None:
+            raise ValueError(f"Unknown tool: {tool_name}")
+
+        # Tool implementations are blocking - keep them off the loop
+        result = await asyncio.to_thread(tool_fn, **params)
         return {"status": "success", "result": result}
     except Exception as e:
         return {"status": "error", "message": str(e)}
@@ -4,15 +4,27 @@ Factory module for creating and managing vector database connections.
 from typing import Dict, Any, Optional
 import json
 import logging
+import os
 from abc import ABC, abstractmethod
-import faiss
 import numpy as np
-import pinecone
-import weaviate
-from sqlite3 import connect
+import sqlite3
+import threading
+
+try:
+    import orjson
+except ImportError:  # optional C-accelerated JSON
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+def _json_dumps(obj):
+    """Serialize metadata with orjson when available (emits bytes)."""
+    return orjson.dumps(obj) if orjson is not None else json.dumps(obj)
+
+def _json_loads(data):
+    """Parse metadata with orjson when available."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 class VectorDB(ABC):
     """Abstract base class for vector database implementations."""
     
@@ -28,30 +40,112 @@ class VectorDB(ABC):
 
 class SQLiteVectorDB(VectorDB):
     """SQLite implementation for vector storage."""
-    
+
+    # Sign bits of a random projection; 2^LSH_BITS buckets in expectation
+    LSH_BITS = 16
+
     def __init__(self, db_path: str):
         self.db_path = db_path
+        # Embeddings live in an append-only sidecar file; SQLite keeps
+        # only offsets, metadata, and the LSH bucket
+        self._vec_path = db_path + ".vecs"
+        self._proj_path = db_path + ".proj.npy"
+        self._H = np.load(self._proj_path) if os.path.exists(self._proj_path) else None
         self._initialize_db()
+
+    def _projection(self, dimension: int) -> np.ndarray:
+        """Return the fixed random-projection matrix, creating it once."""
+        if self._H is None:
+            rng = np.random.default_rng(0)
+            self._H = rng.standard_normal(
+                (self.LSH_BITS, dimension)
+            ).astype(np.float32)
+            np.save(self._proj_path, self._H)
+        return self._H
+
+    def _bucket_of(self, vectors: np.ndarray) -> np.ndarray:
+        """Compute the LSH bucket id for each row of `vectors`."""
+        bits = (vectors @ self._H.T) > 0
+        return bits @ (1 << np.arange(self.LSH_BITS, dtype=np.int64))
     
     def _initialize_db(self):
-        """Create necessary tables if they don't exist."""
-        with connect(self.db_path) as conn:
-            conn.execute("""
+        """Open the long-lived connection and create tables if needed."""
+        # One connection for the life of the instance: schema parse,
+        # page cache, and prepared statements survive across calls
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute("PRAGMA cache_size=-65536")
+        # Refuse to open databases created with the legacy embedding-BLOB
+        # schema: their rows carry no sidecar offsets, so every store and
+        # search would fail quietly forever
+        columns = {
+            row[1]
+            for row in self._conn.execute("PRAGMA table_info(vectors)")
+        }
+        if columns and "vec_offset" not in columns:
+            self._conn.close()
+            raise RuntimeError(
+                f"{self.db_path} uses the legacy embedding-BLOB schema; "
+                "re-store its vectors into a new database to use the "
+                "sidecar layout"
+            )
+        with self._conn:
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS vectors (
                     id INTEGER PRIMARY KEY,
-                    embedding BLOB NOT NULL,
-                    metadata TEXT
+                    vec_offset INTEGER NOT NULL,
+                    metadata TEXT,
+                    bucket INTEGER
                 )
             """)
-    
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_vectors_bucket ON vectors(bucket)"
+            )
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        self._conn.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
     def store_vectors(self, vectors: np.ndarray, metadata: Optional[Dict] = None) -> bool:
         try:
-            with connect(self.db_path) as conn:
-                for i, vector in enumerate(vectors):
-                    meta = json.dumps(metadata[i]) if metadata else None
-                    conn.execute(
-                        "INSERT INTO vectors (embedding, metadata) VALUES (?, ?)",
-                        (vector.tobytes(), meta)
+            data = vectors.astype(np.float32)
+            item_size = data.shape[1] * data.itemsize
+
+            # Bucket every vector with the fixed random projection
+            self._projection(data.shape[1])
+            buckets = self._bucket_of(data)
+
+            # Append the batch and record its rows under one lock; the
+            # tell/write pair must not interleave with another store or
+            # the persisted offsets point at the wrong vectors
+            with self._lock:
+                with open(self._vec_path, "ab") as f:
+                    offset = f.tell()
+                    f.write(data.tobytes())
+
+                # Bind all rows in one executemany so prepare/bind and the
+                # commit fsync are amortized across the whole batch
+                rows = [
+                    (
+                        offset + i * item_size,
+                        _json_dumps(metadata[i]) if metadata else None,
+                        int(buckets[i])
+                    )
+                    for i in range(len(data))
+                ]
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO vectors (vec_offset, metadata, bucket) VALUES (?, ?, ?)",
+                        rows
                     )
             return True
         except Exception as e:
@@ -59,24 +153,71 @@ class SQLiteVectorDB(VectorDB):
             return False
     
     def search_vectors(self, query_vector: np.ndarray, top_k: int = 5) -> Dict[str, Any]:
-        """Basic vector search (not optimized for production use)."""
+        """Approximate vector search over an LSH-shortlisted candidate set."""
         try:
-            results = []
-            with connect(self.db_path) as conn:
-                cursor = conn.execute("SELECT embedding, metadata FROM vectors")
-                for row in cursor:
-                    vector = np.frombuffer(row[0], dtype=np.float32)
-                    distance = np.linalg.norm(query_vector - vector)
-                    metadata = json.loads(row[1]) if row[1] else {}
-                    results.append({
-                        "distance": float(distance),
-                        "metadata": metadata
-                    })
-            
-            # Sort by distance and return top_k
-            results.sort(key=lambda x: x["distance"])
+            query = query_vector.astype(np.float32)
+
+            # Shortlist candidates by bucket: the query's bucket plus
+            # every one-bit-flip Hamming neighbor
+            rows = []
+            if self._H is not None:
+                bucket = int(self._bucket_of(query.reshape(1, -1))[0])
+                candidates = [bucket] + [
+                    bucket ^ (1 << bit) for bit in range(self.LSH_BITS)
+                ]
+                placeholders = ",".join("?" * len(candidates))
+                with self._lock:
+                    rows = self._conn.execute(
+                        f"SELECT id, vec_offset FROM vectors "
+                        f"WHERE bucket IN ({placeholders})",
+                        candidates
+                    ).fetchall()
+
+            # Fall back to the exact full scan when the shortlist is
+            # too small to fill top_k
+            if len(rows) < top_k:
+                with self._lock:
+                    rows = self._conn.execute(
+                        "SELECT id, vec_offset FROM vectors"
+                    ).fetchall()
+
+            if not rows:
+                return {"matches": [], "status": "success"}
+
+            # Memory-map the sidecar file and gather only the
+            # shortlisted rows for the vectorized distance pass
+            item_size = query.shape[-1] * query.itemsize
+            matrix = np.memmap(
+                self._vec_path, dtype=np.float32, mode="r"
+            ).reshape(-1, query.shape[-1])
+            indices = np.array([row[1] // item_size for row in rows])
+            distances = np.linalg.norm(matrix[indices] - query, axis=1)
+
+            # O(N) partition for the top-k, then sort only those k
+            k = min(top_k, distances.shape[0])
+            part = np.argpartition(distances, k - 1)[:k]
+            order = part[np.argsort(distances[part])]
+
+            # Fetch and decode metadata only for the selected matches
+            top_ids = [rows[i][0] for i in order]
+            placeholders = ",".join("?" * len(top_ids))
+            with self._lock:
+                meta_rows = self._conn.execute(
+                    f"SELECT id, metadata FROM vectors WHERE id IN ({placeholders})",
+                    top_ids
+                ).fetchall()
+            meta_by_id = {row_id: meta for row_id, meta in meta_rows}
+
+            matches = [
+                {
+                    "distance": float(distances[i]),
+                    "metadata": _json_loads(meta_by_id[rows[i][0]])
+                    if meta_by_id.get(rows[i][0]) else {}
+                }
+                for i in order
+            ]
             return {
-                "matches": results[:top_k],
+                "matches": matches,
                 "status": "success"
             }
         except Exception as e:
@@ -85,43 +226,123 @@ class SQLiteVectorDB(VectorDB):
 
 class FAISSVectorDB(VectorDB):
     """FAISS implementation for vector search."""
-    
-    def __init__(self, dimension: int):
+
+    def __init__(self, dimension: int, nlist: int = 64, m_pq: int = 8,
+                 nbits: int = 8, nprobe: int = 8):
+        # Deferred import: faiss drags in BLAS libraries that SQLite-only
+        # deployments never need
+        import faiss
+
         self.dimension = dimension
-        self.index = faiss.IndexFlatL2(dimension)
-        self.metadata_store = []
-    
+        # IVF + 8-bit PQ codes: 4x less memory traffic than flat FP32,
+        # and the inverted lists prune most candidates per query
+        self.quantizer = faiss.IndexFlatL2(dimension)
+        self.index = faiss.IndexIVFPQ(self.quantizer, dimension, nlist, m_pq, nbits)
+        self.index.nprobe = nprobe
+        # Columnar metadata store: one NumPy array per field instead of
+        # a Python dict per record
+        self._meta_cols: Dict[str, np.ndarray] = {}
+        self._meta_count = 0
+        self._meta_capacity = 0
+        # IVFPQ needs training data before vectors can be added
+        self._train_buffer = []
+        self._min_train_size = nlist * 39
+        faiss.omp_set_num_threads(os.cpu_count())
+
+    def _append_metadata(self, metadata) -> None:
+        """Append metadata records into the columnar store."""
+        if not self._meta_cols:
+            self._meta_capacity = max(1024, len(metadata))
+            self._meta_cols = {
+                name: np.empty(self._meta_capacity, dtype=object)
+                for name in metadata[0]
+            }
+
+        needed = self._meta_count + len(metadata)
+        if needed > self._meta_capacity:
+            # Grow geometrically so appends stay amortized O(1)
+            while self._meta_capacity < needed:
+                self._meta_capacity *= 2
+            for name, column in self._meta_cols.items():
+                grown = np.empty(self._meta_capacity, dtype=object)
+                grown[:self._meta_count] = column[:self._meta_count]
+                self._meta_cols[name] = grown
+
+        for offset, record in enumerate(metadata):
+            idx = self._meta_count + offset
+            for name, column in self._meta_cols.items():
+                column[idx] = record.get(name)
+        self._meta_count = needed
+
+    def _metadata_at(self, idx: int) -> Dict[str, Any]:
+        """Materialize the metadata dict for one matched index."""
+        if idx < 0 or idx >= self._meta_count:
+            return {}
+        return {name: column[idx] for name, column in self._meta_cols.items()}
+
+    def train(self, sample: np.ndarray) -> None:
+        """Train the IVFPQ index on a representative sample."""
+        self.index.train(sample.astype(np.float32))
+
     def store_vectors(self, vectors: np.ndarray, metadata: Optional[Dict] = None) -> bool:
         try:
             if vectors.shape[1] != self.dimension:
                 raise ValueError(f"Expected vectors of dimension {self.dimension}")
-            
-            self.index.add(vectors)
+
+            vectors = vectors.astype(np.float32)
             if metadata:
-                self.metadata_store.extend(metadata)
+                self._append_metadata(metadata)
+
+            if not self.index.is_trained:
+                # Buffer until we have enough samples to train the index
+                self._train_buffer.append(vectors)
+                buffered = sum(len(b) for b in self._train_buffer)
+                if buffered < self._min_train_size:
+                    return True
+                buffer = np.vstack(self._train_buffer)
+                self._train_buffer = []
+                self.train(buffer)
+                self.index.add(buffer)
+                return True
+
+            self.index.add(vectors)
             return True
         except Exception as e:
             logger.error(f"Error storing vectors in FAISS: {str(e)}")
             return False
     
     def search_vectors(self, query_vector: np.ndarray, top_k: int = 5) -> Dict[str, Any]:
+        """
+        Search for similar vectors, one query or a whole batch at a time.
+
+        Args:
+            query_vector: Single query of shape (D,) or a batch of shape (M, D)
+            top_k: Number of matches to return per query
+
+        Returns:
+            For a single query, a dict with a flat "matches" list; for a
+            batch, "matches" holds one list of match-dicts per query row.
+        """
         try:
-            distances, indices = self.index.search(
-                query_vector.reshape(1, -1),
-                top_k
-            )
-            
-            matches = []
-            for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-                metadata = self.metadata_store[idx] if idx < len(self.metadata_store) else {}
-                matches.append({
-                    "id": int(idx),
-                    "distance": float(distance),
-                    "metadata": metadata
-                })
-            
+            single_query = query_vector.ndim == 1
+            queries = query_vector.reshape(1, -1) if single_query else query_vector
+
+            # One FAISS call covers the whole batch of queries
+            distances, indices = self.index.search(queries, top_k)
+
+            batched_matches = []
+            for row_distances, row_indices in zip(distances, indices):
+                matches = []
+                for distance, idx in zip(row_distances, row_indices):
+                    matches.append({
+                        "id": int(idx),
+                        "distance": float(distance),
+                        "metadata": self._metadata_at(int(idx))
+                    })
+                batched_matches.append(matches)
+
             return {
-                "matches": matches,
+                "matches": batched_matches[0] if single_query else batched_matches,
                 "status": "success"
             }
         except Exception as e:
@@ -132,6 +353,9 @@ class PineconeVectorDB(VectorDB):
     """Pinecone implementation for vector search."""
     
     def __init__(self, api_key: str, environment: str, index_name: str):
+        # Deferred import: pinecone initializes network stubs on import
+        import pinecone
+
         pinecone.init(api_key=api_key, environment=environment)
         self.index = pinecone.Index(index_name)
     
@@ -178,7 +402,13 @@ def create_vector_db(config: Dict[str, Any]) -> VectorDB:
     if db_type == "sqlite":
         return SQLiteVectorDB(config["location"])
     elif db_type == "faiss":
-        return FAISSVectorDB(config.get("dimension", 768))  # Default to BERT dimension
+        return FAISSVectorDB(
+            config.get("dimension", 768),  # Default to BERT dimension
+            nlist=config.get("nlist", 64),
+            m_pq=config.get("m_pq", 8),
+            nbits=config.get("nbits", 8),
+            nprobe=config.get("nprobe", 8)
+        )
     elif db_type == "pinecone":
         return PineconeVectorDB(
             config["api_key"],
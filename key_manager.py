@@ -2,17 +2,27 @@
 Secure key management system for handling API keys.
 Supports different key types (Normal API Keys and Service Keys) with appropriate security measures.
 """
-from typing import Dict, Any, Optional, Literal
+from typing import Dict, Any, Optional, Literal, List, Tuple
+import copy
+import functools
 import os
 import json
+import time
 from datetime import datetime, timedelta
 import logging
 from pathlib import Path
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 import base64
 
 logger = logging.getLogger(__name__)
 
+@functools.lru_cache(maxsize=32)
+def _load_json_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a JSON file once per (path, mtime) pair."""
+    with open(path, 'r') as f:
+        return json.load(f)
+
 KeyType = Literal["normal", "service"]
 Environment = Literal["development", "staging", "production"]
 
@@ -37,25 +47,46 @@ class KeyManager:
         self._load_config()
         self._initialize_encryption()
         self._setup_monitoring()
+        # Decrypted-key cache: name -> (generation, expires_at, value).
+        # The generation counter invalidates everything on store/rotate
+        self._key_cache: Dict[str, Any] = {}
+        self._key_cache_ttl = 60.0
+        self._generation = 0
+        # Resolve the storage directory once; mkdir per store was an
+        # unconditional syscall per key write
+        self._storage_dir = Path("secure_storage")
+        self._storage_dir.mkdir(exist_ok=True)
         
     def _load_config(self) -> None:
         """Load key configuration from file."""
         try:
-            with open(self.config_path, 'r') as f:
-                self.config = json.load(f)
+            mtime_ns = os.stat(self.config_path).st_mtime_ns
+            # Deep-copy so per-instance mutations never leak into the
+            # shared parse cache
+            self.config = copy.deepcopy(
+                _load_json_cached(self.config_path, mtime_ns)
+            )
         except Exception as e:
             logger.error(f"Error loading key config: {str(e)}")
             self.config = {"keys": {}}
+        self._config_dirty = False
     
     def _initialize_encryption(self) -> None:
         """Initialize encryption key for secure storage."""
         # Use different encryption keys for different environments
         key = os.getenv(f"KEY_ENCRYPTION_KEY_{self.environment.upper()}")
-        if not key:
-            key = Fernet.generate_key()
+        if key:
+            key_bytes = base64.urlsafe_b64decode(key)
+            fernet_key = key.encode()
+        else:
+            key_bytes = AESGCM.generate_key(bit_length=256)
+            fernet_key = base64.urlsafe_b64encode(key_bytes)
             logger.warning(f"No encryption key found for {self.environment}. Generated new key.")
-        
-        self.cipher_suite = Fernet(key)
+
+        self._aead = AESGCM(key_bytes)
+        # Blobs written before the AESGCM switch are Fernet tokens under
+        # the same environment key; keep a decryptor around for them
+        self._legacy_fernet = Fernet(fernet_key)
     
     def _setup_monitoring(self) -> None:
         """Setup monitoring based on environment."""
@@ -81,12 +112,21 @@ class KeyManager:
         Returns:
             The API key if found, None otherwise
         """
+        # Serve recent hits from the cache unless a rotation happened
+        cached = self._key_cache.get(key_name)
+        if cached:
+            generation, expires_at, value = cached
+            if generation == self._generation and time.monotonic() < expires_at:
+                return value
+            del self._key_cache[key_name]
+
         # First try environment variable
         env_key = os.getenv(f"{key_name.upper()}_{self.environment.upper()}")
         if env_key:
             self._log_access(key_name, "environment", self.environment)
+            self._cache_key(key_name, env_key)
             return env_key
-            
+
         # Then try secure storage
         key_config = self.config["keys"].get(key_name)
         if key_config:
@@ -94,14 +134,25 @@ class KeyManager:
             if not self._validate_key_for_environment(key_config):
                 logger.warning(f"Key {key_name} not suitable for {self.environment}")
                 return None
-                
+
             encrypted_key = self._get_from_secure_storage(key_name)
             if encrypted_key:
-                self._log_access(key_name, "secure_storage", self.environment)
-                return self._decrypt_key(encrypted_key)
-        
+                value = self._decrypt_key(encrypted_key)
+                if value is not None:
+                    self._log_access(key_name, "secure_storage", self.environment)
+                    self._cache_key(key_name, value)
+                return value
+
         logger.error(f"Key {key_name} not found")
         return None
+
+    def _cache_key(self, key_name: str, value: str) -> None:
+        """Cache a resolved key for the TTL window."""
+        self._key_cache[key_name] = (
+            self._generation,
+            time.monotonic() + self._key_cache_ttl,
+            value
+        )
     
     def store_key(self, 
                   key_name: str, 
@@ -140,11 +191,14 @@ class KeyManager:
                 "description": description or f"API key for {key_name}",
                 "rotation_period_days": 30 if key_type == "service" else 90,
                 "last_rotated": datetime.now().isoformat(),
+                "last_rotated_epoch": time.time(),
                 "owner": owner,
                 "environment": self.environment
             }
-            
+
+            self._config_dirty = True
             self._save_config()
+            self._generation += 1
             logger.info(f"Stored {key_type} key {key_name} for {self.environment}")
             return True
             
@@ -152,6 +206,119 @@ class KeyManager:
             logger.error(f"Error storing key {key_name}: {str(e)}")
             return False
     
+    def get_keys(self, key_names: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Resolve several API keys in one batch.
+
+        Args:
+            key_names: Names of the keys to retrieve
+
+        Returns:
+            Mapping of key name to its value, or None when not found
+        """
+        results: Dict[str, Optional[str]] = {}
+        env = os.environ
+        env_suffix = f"_{self.environment.upper()}"
+
+        # One directory listing instead of an open() probe per key
+        try:
+            available = {entry.name for entry in os.scandir(self._storage_dir)}
+        except FileNotFoundError:
+            available = set()
+
+        now = time.monotonic()
+        for key_name in key_names:
+            cached = self._key_cache.get(key_name)
+            if cached:
+                generation, expires_at, value = cached
+                if generation == self._generation and now < expires_at:
+                    results[key_name] = value
+                    continue
+                del self._key_cache[key_name]
+
+            env_key = env.get(f"{key_name.upper()}{env_suffix}")
+            if env_key:
+                self._log_access(key_name, "environment", self.environment)
+                self._cache_key(key_name, env_key)
+                results[key_name] = env_key
+                continue
+
+            key_config = self.config["keys"].get(key_name)
+            if (key_config
+                    and self._validate_key_for_environment(key_config)
+                    and f"{key_name}.key" in available):
+                with open(self._storage_dir / f"{key_name}.key", "rb") as f:
+                    encrypted_key = f.read()
+                value = self._decrypt_key(encrypted_key)
+                if value is not None:
+                    self._log_access(key_name, "secure_storage", self.environment)
+                    self._cache_key(key_name, value)
+                results[key_name] = value
+            else:
+                results[key_name] = None
+
+        return results
+
+    def store_keys(self, items: List[Tuple]) -> bool:
+        """
+        Securely store several API keys in one batch.
+
+        Args:
+            items: Tuples of (key_name, key_value) or
+                (key_name, key_value, key_type)
+
+        Returns:
+            True if every key was stored, False otherwise
+        """
+        wrote_any = False
+        try:
+            # Validate and encrypt the whole batch before any write, so a
+            # bad item rejects the batch without leaving partial state
+            prepared = []
+            for item in items:
+                key_name, key_value = item[0], item[1]
+                key_type = item[2] if len(item) > 2 else "normal"
+
+                if not self._validate_key_type_for_environment(key_type):
+                    logger.error(f"Key type {key_type} not allowed in {self.environment}")
+                    return False
+
+                prepared.append((key_name, key_type, self._encrypt_key(key_value)))
+
+            # One timestamp and one config flush cover the whole batch
+            now_iso = datetime.now().isoformat()
+            now_epoch = time.time()
+            for key_name, key_type, encrypted_key in prepared:
+                self._store_in_secure_storage(key_name, encrypted_key)
+                wrote_any = True
+
+                self.config["keys"][key_name] = {
+                    "type": key_type,
+                    "description": f"API key for {key_name}",
+                    "rotation_period_days": 30 if key_type == "service" else 90,
+                    "last_rotated": now_iso,
+                    "last_rotated_epoch": now_epoch,
+                    "owner": "System",
+                    "environment": self.environment
+                }
+
+            self._config_dirty = True
+            self._save_config()
+            self._generation += 1
+            logger.info(f"Stored {len(items)} keys for {self.environment}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error storing key batch: {str(e)}")
+            # An I/O failure mid-loop leaves earlier keys on disk: flush
+            # the config entries that match them and invalidate the cache
+            # so nothing serves stale plaintext
+            if wrote_any:
+                self._config_dirty = True
+                self._save_config()
+                self._generation += 1
+            return False
+
     def _validate_key_for_environment(self, key_config: Dict[str, Any]) -> bool:
         """Validate if a key is appropriate for the current environment."""
         key_type = key_config.get("type", "normal")
@@ -191,8 +358,11 @@ class KeyManager:
             # This might involve calling the API provider's key rotation endpoint
             
             key_config["last_rotated"] = datetime.now().isoformat()
+            key_config["last_rotated_epoch"] = time.time()
+            self._config_dirty = True
             self._save_config()
-            
+            self._generation += 1
+
             logger.info(f"Rotated key {key_name} in {self.environment}")
             return True
             
@@ -210,10 +380,16 @@ class KeyManager:
         if not self._validate_key_for_environment(key_config):
             return False
             
-        last_rotated = datetime.fromisoformat(key_config["last_rotated"])
-        rotation_period = timedelta(days=key_config["rotation_period_days"])
-        
-        return datetime.now() - last_rotated > rotation_period
+        last_rotated_epoch = key_config.get("last_rotated_epoch")
+        if last_rotated_epoch is None:
+            # Backfill configs written before epoch timestamps existed
+            last_rotated_epoch = datetime.fromisoformat(
+                key_config["last_rotated"]
+            ).timestamp()
+            key_config["last_rotated_epoch"] = last_rotated_epoch
+
+        rotation_period = key_config["rotation_period_days"] * 86400.0
+        return time.time() - last_rotated_epoch > rotation_period
     
     def _log_access(self, key_name: str, source: str, environment: str) -> None:
         """Log key access with enhanced monitoring for production."""
@@ -231,34 +407,48 @@ class KeyManager:
             logger.info(f"Key {key_name} accessed from {source} in {environment}")
 
     def _encrypt_key(self, key: str) -> bytes:
-        """Encrypt an API key."""
-        return self.cipher_suite.encrypt(key.encode())
+        """Encrypt an API key; the 12-byte nonce is prepended to the ciphertext."""
+        nonce = os.urandom(12)
+        return nonce + self._aead.encrypt(nonce, key.encode(), None)
 
-    def _decrypt_key(self, encrypted_key: bytes) -> str:
-        """Decrypt an API key."""
-        return self.cipher_suite.decrypt(encrypted_key).decode()
+    def _decrypt_key(self, encrypted_key: bytes) -> Optional[str]:
+        """Decrypt an API key, accepting legacy Fernet blobs as well."""
+        try:
+            return self._aead.decrypt(
+                encrypted_key[:12], encrypted_key[12:], None
+            ).decode()
+        except Exception:
+            try:
+                return self._legacy_fernet.decrypt(encrypted_key).decode()
+            except Exception:
+                logger.error(
+                    "Failed to decrypt stored key (wrong encryption key "
+                    "or corrupt blob)"
+                )
+                return None
 
     def _store_in_secure_storage(self, key_name: str, encrypted_key: bytes) -> None:
         """Store encrypted key in secure storage."""
-        storage_path = Path("secure_storage")
-        storage_path.mkdir(exist_ok=True)
-
-        with open(storage_path / f"{key_name}.key", "wb") as f:
+        with open(self._storage_dir / f"{key_name}.key", "wb") as f:
             f.write(encrypted_key)
 
     def _get_from_secure_storage(self, key_name: str) -> Optional[bytes]:
         """Retrieve encrypted key from secure storage."""
         try:
-            with open(Path("secure_storage") / f"{key_name}.key", "rb") as f:
+            with open(self._storage_dir / f"{key_name}.key", "rb") as f:
                 return f.read()
         except FileNotFoundError:
             return None
 
     def _save_config(self) -> None:
-        """Save the current configuration to file."""
+        """Save the current configuration to file if it changed."""
+        if not self._config_dirty:
+            return
         try:
             with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=2)
+                # Compact separators: half the bytes of indent=2 output
+                json.dump(self.config, f, separators=(',', ':'))
+            self._config_dirty = False
         except Exception as e:
             logger.error(f"Error saving key config: {str(e)}")
 
@@ -6,6 +6,7 @@ Provides type-safe parameter handling, validation, and model-specific configurat
 from typing import Dict, Any, Optional, List, Union, TypedDict, Literal
 from dataclasses import dataclass, field
 import logging
+import os
 from enum import Enum
 import json
 from pathlib import Path
@@ -51,11 +52,27 @@ class ModelConfig:
     
     # Load parameter definitions and defaults
     CONFIG_PATH = "config/model_parameters_config.json"
-    
+
+    # Process-wide instance shared by every ParameterManager
+    _instance = None
+    _instance_mtime_ns = None
+
     def __init__(self):
         """Initialize with configuration from file"""
         self.load_config()
-    
+
+    @classmethod
+    def instance(cls) -> "ModelConfig":
+        """Return the shared config, re-parsing only when the file changes."""
+        try:
+            mtime_ns = os.stat(cls.CONFIG_PATH).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if cls._instance is None or mtime_ns != cls._instance_mtime_ns:
+            cls._instance = cls()
+            cls._instance_mtime_ns = mtime_ns
+        return cls._instance
+
     def load_config(self):
         """Load parameter definitions and defaults from config file"""
         try:
@@ -67,13 +84,36 @@ class ModelConfig:
         except Exception as e:
             logger.error(f"Error loading parameter config: {str(e)}")
             raise
+        self.validators = {
+            param_name: self._build_validator(param_info)
+            for param_name, param_info in self.parameter_definitions.items()
+        }
+
+    @staticmethod
+    def _build_validator(param_info: Dict[str, Any]):
+        """Compile one definition into a single check callable."""
+        checks = []
+        if "range" in param_info:
+            lo, hi = param_info["range"]
+            checks.append(lambda value, lo=lo, hi=hi: lo <= value <= hi)
+        if "allowed_values" in param_info:
+            checks.append(param_info["allowed_values"].__contains__)
+
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+        return lambda value: all(check(value) for check in checks)
 
 class ParameterManager:
     """Manages parameters for different model types with validation"""
     
     def __init__(self):
         """Initialize with model configuration"""
-        self.config = ModelConfig()
+        self.config = ModelConfig.instance()
+        # Memoized results for repeated (model, type, kwargs) requests,
+        # e.g. the ParameterPresets helpers called with fixed arguments
+        self._param_cache: Dict[tuple, Dict[str, Any]] = {}
     
     def get_parameter_info(self, param_name: str) -> Dict[str, Any]:
         """Get information about a parameter"""
@@ -81,28 +121,19 @@ class ParameterManager:
     
     def validate_parameter(self, param_name: str, value: Any) -> bool:
         """Validate a parameter value against its definition"""
-        param_info = self.get_parameter_info(param_name)
-        
-        if not param_info:
-            return True  # Unknown parameter, assume valid
-            
-        if "range" in param_info:
-            min_val, max_val = param_info["range"]
-            if not min_val <= value <= max_val:
-                logger.warning(
-                    f"Parameter {param_name} value {value} outside range "
-                    f"[{min_val}, {max_val}]"
-                )
-                return False
-                
-        if "allowed_values" in param_info and value not in param_info["allowed_values"]:
-            logger.warning(
-                f"Parameter {param_name} value {value} not in allowed values: "
-                f"{param_info['allowed_values']}"
-            )
-            return False
-            
-        return True
+        validator = self.config.validators.get(param_name)
+
+        if validator is None:
+            return True  # Unknown or unconstrained parameter, assume valid
+
+        if validator(value):
+            return True
+
+        logger.warning(
+            f"Parameter {param_name} value {value} violates its definition: "
+            f"{self.get_parameter_info(param_name)}"
+        )
+        return False
     
     def get_model_parameters(self, 
                            model: str, 
@@ -119,20 +150,32 @@ class ParameterManager:
         Returns:
             Dictionary of validated parameters
         """
+        # Identical requests return a copy of the memoized result; keys
+        # with unhashable values (lists, logit_bias dicts) skip the cache
+        try:
+            key = (model, model_type, tuple(sorted(kwargs.items())))
+            cached = self._param_cache.get(key)
+        except TypeError:
+            key = cached = None
+        if cached is not None:
+            return cached.copy()
+
         # Start with model defaults
-        params = self.config.model_defaults.get(model, {}).copy()
-        
+        params = dict(self.config.model_defaults.get(model, ()))
+
         # Add provided parameters
         for param, value in kwargs.items():
             if self.validate_parameter(param, value):
                 params[param] = value
-        
+
         # Add model-specific handling
         if model_type == ModelType.AUDIO:
             self._handle_audio_parameters(params, kwargs)
         elif model_type == ModelType.IMAGE:
             self._handle_image_parameters(params, kwargs)
-        
+
+        if key is not None:
+            self._param_cache[key] = params.copy()
         return params
     
     def _handle_audio_parameters(self, params: Dict[str, Any], kwargs: Dict[str, Any]):
@@ -55,6 +55,56 @@ class ModelSelector:
             logger.warning(f"Error loading config from {self.config_path}: {str(e)}")
             logger.info("Using default model configuration")
             self.config = {}
+        self._valid_models = self._build_valid_models()
+        # Invert the RAG config so per-model lookups skip the linear scan
+        self._embedding_to_rag_model = {
+            rag_model["embedding_model"]: rag_model
+            for rag_model in self.config.get("rag_models", {}).values()
+            if "embedding_model" in rag_model
+        }
+        self._model_config_cache: Dict[str, Dict[str, Any]] = {}
+        self._flat_models = self._build_flat_models()
+        self._fallback = self.DEFAULT_MODELS["text_generation"]["simple"]["short"]
+
+    def _build_flat_models(self) -> Dict[tuple, str]:
+        """Flatten model selection into one (task, complexity, length) table."""
+        # Embedding resolves through the RAG config first, as before
+        embedding_model = self.DEFAULT_MODELS["embedding"]
+        for rag_model in self.config.get("rag_models", {}).values():
+            if "embedding_model" in rag_model:
+                embedding_model = rag_model["embedding_model"]
+                break
+
+        # Single-model tasks key on task_type alone so the complexity
+        # and context_length arguments (including None) never matter
+        self._single_models = {
+            "embedding": embedding_model,
+            "real_time": self.DEFAULT_MODELS["real_time"],
+            "audio": self.DEFAULT_MODELS["audio"]
+        }
+
+        flat = {}
+        for complexity, by_length in self.DEFAULT_MODELS["text_generation"].items():
+            for context_length, model in by_length.items():
+                flat[("text_generation", complexity, context_length)] = model
+        return flat
+
+    def _build_valid_models(self) -> frozenset:
+        """Collect every known model name into one set for O(1) validation."""
+        names = []
+
+        def walk(node):
+            if isinstance(node, dict):
+                for child in node.values():
+                    walk(child)
+            else:
+                names.append(node)
+
+        walk(self.DEFAULT_MODELS)
+        for rag_model in self.config.get("rag_models", {}).values():
+            if "embedding_model" in rag_model:
+                names.append(rag_model["embedding_model"])
+        return frozenset(names)
 
     def select_model(self, 
                     task_type: TaskType,
@@ -71,29 +121,15 @@ class ModelSelector:
         Returns:
             Selected model name
         """
-        try:
-            # Handle embedding models
-            if task_type == "embedding":
-                # Check RAG config first
-                for rag_model in self.config.get("rag_models", {}).values():
-                    if "embedding_model" in rag_model:
-                        return rag_model["embedding_model"]
-                return self.DEFAULT_MODELS["embedding"]
-
-            # Handle real-time and audio models
-            if task_type in ["real_time", "audio"]:
-                return self.DEFAULT_MODELS[task_type]
-
-            # Handle text generation models
-            if task_type == "text_generation":
-                return self.DEFAULT_MODELS["text_generation"][complexity][context_length]
-
-            # Default fallback
-            return self.DEFAULT_MODELS["text_generation"]["simple"]["short"]
-
-        except Exception as e:
-            logger.error(f"Error selecting model: {str(e)}")
-            return self.DEFAULT_MODELS["text_generation"]["simple"]["short"]
+        # Single-model tasks resolve on task_type alone; everything else
+        # is one hash lookup against the precomputed table, with unknown
+        # combinations falling back to the default text model
+        model = self._single_models.get(task_type)
+        if model is not None:
+            return model
+        return self._flat_models.get(
+            (task_type, complexity, context_length), self._fallback
+        )
 
     def get_model_config(self, model_name: str) -> Dict[str, Any]:
         """
@@ -105,19 +141,23 @@ class ModelSelector:
         Returns:
             Model configuration dictionary
         """
-        # First check RAG config
-        for rag_model in self.config.get("rag_models", {}).values():
-            if rag_model.get("embedding_model") == model_name:
-                return rag_model
-
-        # Return default config
-        return {
-            "max_tokens": 4096 if "16k" in model_name else 2048,
-            "temperature": 0.7,
-            "top_p": 1.0,
-            "frequency_penalty": 0.0,
-            "presence_penalty": 0.0
-        }
+        cached = self._model_config_cache.get(model_name)
+        if cached is not None:
+            return cached
+
+        # First check the inverted RAG index, then fall back to defaults
+        config = self._embedding_to_rag_model.get(model_name)
+        if config is None:
+            config = {
+                "max_tokens": 4096 if "16k" in model_name else 2048,
+                "temperature": 0.7,
+                "top_p": 1.0,
+                "frequency_penalty": 0.0,
+                "presence_penalty": 0.0
+            }
+
+        self._model_config_cache[model_name] = config
+        return config
 
     def validate_model(self, model_name: str) -> bool:
         """
@@ -129,24 +169,7 @@ class ModelSelector:
         Returns:
             True if model is supported, False otherwise
         """
-        # Check in default models
-        for category in self.DEFAULT_MODELS.values():
-            if isinstance(category, dict):
-                for subcategory in category.values():
-                    if isinstance(subcategory, dict):
-                        if model_name in subcategory.values():
-                            return True
-                    elif subcategory == model_name:
-                        return True
-            elif category == model_name:
-                return True
-
-        # Check in RAG config
-        for rag_model in self.config.get("rag_models", {}).values():
-            if rag_model.get("embedding_model") == model_name:
-                return True
-
-        return False
+        return model_name in self._valid_models
 
 # Example usage
 if __name__ == "__main__":
@@ -3,80 +3,176 @@ Preprocessing module for text cleaning, parameter validation, and embedding prep
 """
 from typing import Dict, Any, Union, List
 import re
+import string
 import unicodedata
 
+try:
+    import re2 as _re2
+except ImportError:  # optional DFA regex engine
+    _re2 = None
+
+def _compile_pattern(pattern: str):
+    """Compile with the RE2 DFA engine when available, else stdlib re."""
+    if _re2 is not None:
+        try:
+            return _re2.compile(pattern)
+        except Exception:
+            pass
+    return re.compile(pattern)
+
+# Patterns compiled once at import so hot loops skip the re-cache lookup
+_WS = _compile_pattern(r'\s+')
+_SPECIAL = _compile_pattern(r'[^\w\s.,!?-]')
+_QUERY_SPECIAL = _compile_pattern(r'[^\w\s]')
+# Token prefixes marking URLs; matched with one startswith per token
+_URL_PREFIXES = ("http", "www.")
+
+# Units that make a preceding bare number worth keeping
+_NUMBER_UNITS = frozenset(
+    unit + suffix
+    for unit in ("year", "month", "day", "dollar", "percent", "%")
+    for suffix in ("", "s")
+)
+
+def _strip_embed_tokens(text: str) -> str:
+    """Drop URL, email, and bare-number tokens in one linear pass.
+
+    One split/join replaces the regex alternation and its digit
+    lookahead: backtracking went quadratic on malformed URLs in scraped
+    corpora, and the lookahead forced engine state on every digit run.
+    A number survives only when the next token is a known unit.
+    """
+    tokens = text.split()
+    kept = []
+    last = len(tokens) - 1
+    for i, token in enumerate(tokens):
+        if token.startswith(_URL_PREFIXES) or '@' in token:
+            continue
+        if token.isdigit():
+            # Units may carry trailing punctuation kept by clean_text
+            if i == last or tokens[i + 1].rstrip('.,!?-') not in _NUMBER_UNITS:
+                continue
+        kept.append(token)
+    return ' '.join(kept)
+
+# Deletion table mirroring _SPECIAL for the ASCII fast path: keep word
+# chars (including underscore), whitespace, and .,!?-
+_KEEP = set(string.ascii_letters + string.digits + string.whitespace + '_.,!?-')
+_DEL_TABLE = dict.fromkeys(i for i in range(128) if chr(i) not in _KEEP)
+
+# Fused table for the embedding fast path: deletes specials and
+# lowercases in the same C-level pass
+_FUSED_TABLE = dict(_DEL_TABLE)
+_FUSED_TABLE.update(
+    (ord(upper), ord(lower))
+    for upper, lower in zip(string.ascii_uppercase, string.ascii_lowercase)
+)
+
+# Query table: lowercases and maps everything outside [\w\s] to a space,
+# mirroring _QUERY_SPECIAL, in one translate pass
+_QUERY_TABLE = {
+    ord(upper): ord(lower)
+    for upper, lower in zip(string.ascii_uppercase, string.ascii_lowercase)
+}
+_QUERY_TABLE.update(
+    (i, 32) for i in range(128)
+    if not (chr(i).isalnum() or chr(i).isspace() or chr(i) == '_')
+)
+
 def clean_text(text: str) -> str:
     """
     Remove unnecessary characters and normalize text formatting.
-    
+
     Args:
         text: Input text to clean
-        
+
     Returns:
         Cleaned text with normalized spacing and formatting
     """
-    # Normalize unicode characters
+    # Normalize unicode, collapse whitespace, drop special characters
     text = unicodedata.normalize('NFKD', text)
-    
-    # Replace multiple spaces and newlines with single space
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove special characters but keep punctuation
-    text = re.sub(r'[^\w\s.,!?-]', '', text)
-    
+    text = _WS.sub(' ', text)
+    if text.isascii():
+        # str.translate is a plain C loop - much cheaper than the
+        # regex engine for the common ASCII case
+        text = text.translate(_DEL_TABLE)
+    else:
+        text = _SPECIAL.sub('', text)
+
     return text.strip()
 
 def clean_query(query: str) -> str:
     """
     Clean and normalize search queries.
-    
+
     Args:
         query: Input search query
-        
+
     Returns:
         Cleaned and normalized query
     """
+    # One translate pass lowercases and spaces out special characters
+    if query.isascii():
+        return ' '.join(query.translate(_QUERY_TABLE).split())
+
     # Remove special characters that might affect search
-    query = re.sub(r'[^\w\s]', ' ', query.lower())
-    
+    query = _QUERY_SPECIAL.sub(' ', query.lower())
+
     # Remove extra whitespace
     query = ' '.join(query.split())
-    
+
     return query.strip()
 
+def _validate_str(stack, out, key, value):
+    """Convert digit strings at dict level to int, clean the rest."""
+    if value.isdigit() and type(out) is not list:
+        out[key] = int(value)
+    else:
+        out[key] = clean_text(value)
+
+def _validate_dict(stack, out, key, value):
+    """Attach a fresh dict and queue its items for processing."""
+    child = {}
+    out[key] = child
+    stack.extend((child, k, v) for k, v in value.items())
+
+def _validate_list(stack, out, key, value):
+    """Attach a presized list and queue its items for processing."""
+    child = [None] * len(value)
+    out[key] = child
+    stack.extend((child, i, item) for i, item in enumerate(value))
+
+# Exact-type dispatch: one dict lookup replaces the isinstance chain
+_VALIDATE_DISPATCH = {
+    str: _validate_str,
+    dict: _validate_dict,
+    list: _validate_list
+}
+
 def validate_parameters(params: Dict[str, Any]) -> Dict[str, Any]:
     """
     Validate and clean parameters for tool calls.
-    
+
+    Nested dicts and lists are walked iteratively with an explicit
+    work-stack, so deeply nested schemas cost no recursion frames.
+
     Args:
         params: Dictionary of parameters to validate
-        
+
     Returns:
         Validated and cleaned parameters
     """
-    cleaned_params = {}
-    
-    for key, value in params.items():
-        # Convert string numbers to actual numbers
-        if isinstance(value, str) and value.isdigit():
-            cleaned_params[key] = int(value)
-        # Clean text parameters
-        elif isinstance(value, str):
-            cleaned_params[key] = clean_text(value)
-        # Handle nested dictionaries
-        elif isinstance(value, dict):
-            cleaned_params[key] = validate_parameters(value)
-        # Handle lists
-        elif isinstance(value, list):
-            cleaned_params[key] = [
-                validate_parameters(item) if isinstance(item, dict)
-                else clean_text(item) if isinstance(item, str)
-                else item
-                for item in value
-            ]
+    cleaned_params: Dict[str, Any] = {}
+    stack = [(cleaned_params, key, value) for key, value in params.items()]
+
+    while stack:
+        out, key, value = stack.pop()
+        handler = _VALIDATE_DISPATCH.get(type(value))
+        if handler is not None:
+            handler(stack, out, key, value)
         else:
-            cleaned_params[key] = value
-            
+            out[key] = value
+
     return cleaned_params
 
 def filter_data(data: Union[List, Dict], min_length: int = 10) -> Union[List, Dict]:
@@ -86,19 +182,23 @@ def filter_data(data: Union[List, Dict], min_length: int = 10) -> Union[List, Di
     Args:
         data: Input data to filter
         min_length: Minimum length for text content
-        
+
     Returns:
-        Filtered data meeting quality criteria
+        Filtered data meeting quality criteria, with text already cleaned
     """
+    # Clean once and keep the result - downstream embedding would
+    # otherwise re-run clean_text over the same corpus
     if isinstance(data, list):
         return [
-            item for item in data
-            if isinstance(item, str) and len(clean_text(item)) >= min_length
+            cleaned for item in data
+            if isinstance(item, str)
+            and len(cleaned := clean_text(item)) >= min_length
         ]
     elif isinstance(data, dict):
         return {
-            key: value for key, value in data.items()
-            if isinstance(value, str) and len(clean_text(value)) >= min_length
+            key: cleaned for key, value in data.items()
+            if isinstance(value, str)
+            and len(cleaned := clean_text(value)) >= min_length
         }
     return data
 
@@ -113,9 +213,30 @@ def preprocess_for_embedding(text: Union[str, List[str]]) -> Union[str, List[str
         Preprocessed text ready for embedding
     """
     if isinstance(text, list):
-        return [preprocess_single_text(t) for t in text]
+        return preprocess_batch(text)
     return preprocess_single_text(text)
 
+def preprocess_batch(texts: List[str], parallel_threshold: int = 1000) -> List[str]:
+    """
+    Preprocess a batch of texts for embedding.
+
+    Args:
+        texts: List of texts to preprocess
+        parallel_threshold: Batch size above which work is sharded
+            across processes
+
+    Returns:
+        List of preprocessed texts in input order
+    """
+    if len(texts) > parallel_threshold:
+        # The regex work is CPU-bound; shard big corpora across cores
+        from multiprocessing import Pool
+        with Pool() as pool:
+            return pool.map(preprocess_single_text, texts, chunksize=256)
+
+    # map() keeps the per-item dispatch in C for small batches
+    return list(map(preprocess_single_text, texts))
+
 def preprocess_single_text(text: str) -> str:
     """
     Preprocess a single text for embedding.
@@ -126,22 +247,18 @@ def preprocess_single_text(text: str) -> str:
     Returns:
         Preprocessed text ready for embedding
     """
+    # ASCII fast path: one fused translate handles the cleaning and
+    # lowercasing, and the token scan's split normalizes whitespace, so
+    # the whole pipeline is two passes over the text
+    if text.isascii():
+        return _strip_embed_tokens(text.translate(_FUSED_TABLE))
+
     # Clean the text
     text = clean_text(text)
-    
+
     # Convert to lowercase for consistency
     text = text.lower()
-    
-    # Remove URLs
-    text = re.sub(r'http\S+|www.\S+', '', text)
-    
-    # Remove email addresses
-    text = re.sub(r'\S+@\S+', '', text)
-    
-    # Remove numbers but keep important ones in context
-    text = re.sub(r'\b\d+\b(?!\s*(?:year|month|day|dollar|percent|%)s?\b)', '', text)
-    
-    # Normalize whitespace again
-    text = ' '.join(text.split())
-    
-    return text.strip()
+
+    # Strip URL, email, and bare-number tokens; the join already
+    # normalizes whitespace
+    return _strip_embed_tokens(text)
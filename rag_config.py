@@ -3,20 +3,74 @@ Configuration handler for RAG models, embedding models, and vector databases.
 Provides comprehensive configuration management for the RAG system.
 """
 from typing import Dict, Any, Optional, List, TypedDict, Literal
+import copy
+import functools
 import json
 import logging
-from dataclasses import dataclass
+import re
 from pathlib import Path
 from model_parameters import ModelType, ParameterManager
 
+try:
+    import orjson
+except ImportError:  # optional C-accelerated JSON
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+def _json_loads(data):
+    """Parse JSON bytes with orjson when available."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+# Model reference inside a custom rule action string; the explicit
+# character classes stop the match at punctuation instead of grabbing
+# whatever non-space text follows the model name
+_RULE_RE = re.compile(r"Use (?P<model>text-embedding-[\w-]+|gpt-[\w.-]+)")
+
+# Default system configuration, built once per process and deep-copied
+# per manager; lazy so importing this module needs no config files
+_default_system_config: Optional[Dict[str, Any]] = None
+
+def _default_system_config_template() -> Dict[str, Any]:
+    """Build (once) the template every manager's system_config copies."""
+    global _default_system_config
+    if _default_system_config is None:
+        _default_system_config = {
+            "embedding_model": "text-embedding-ada-002",
+            "vector_database": "pinecone",
+            "vector_search_params": {"top_k": 5},
+            "llm_model": "gpt-4",
+            "llm_params": ParameterManager().get_model_parameters(
+                "gpt-4",
+                ModelType.CHAT,
+                temperature=0.7,
+                max_tokens=1500
+            ),
+            "logging": {"enabled": True, "log_level": "info"}
+        }
+    return _default_system_config
+
+@functools.lru_cache(maxsize=64)
+def _load_json_cached(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a JSON config once per (path, mtime); stale entries age out
+    of the cache when the file changes."""
+    # Binary read skips the Python-level decode; orjson parses bytes
+    with open(path_str, 'rb') as f:
+        return _json_loads(f.read())
+
 class EmbeddingModelConfig(TypedDict):
     """Configuration for embedding models"""
     type: str
     description: str
     vector_size: int
 
+# Shared default embedding config, built once instead of per miss
+_DEFAULT_EMBEDDING: EmbeddingModelConfig = {
+    "type": "OpenAI",
+    "description": "Default OpenAI embedding model",
+    "vector_size": 1536
+}
+
 class VectorDBConfig(TypedDict):
     """Configuration for vector databases"""
     type: Literal["Managed", "Local"]
@@ -41,7 +95,6 @@ class RAGSystemConfig(TypedDict):
     llm_params: Dict[str, Any]
     logging: Dict[str, Any]
 
-@dataclass
 class RAGConfigManager:
     """Manager for RAG system configuration"""
     
@@ -54,33 +107,64 @@ class RAGConfigManager:
         """
         self.config_dir = Path(config_dir)
         self.param_manager = ParameterManager()
-        self._load_configurations()
-    
-    def _load_configurations(self):
-        """Load all configuration files"""
-        self.rag_models = self._load_config("rag_models_config.json")
-        self.vector_db = self._load_config("vector_db_config.json")
-        
-        # Initialize system configuration
-        self.system_config: RAGSystemConfig = {
-            "embedding_model": "text-embedding-ada-002",
-            "vector_database": "pinecone",
-            "vector_search_params": {"top_k": 5},
-            "llm_model": "gpt-4",
-            "llm_params": self.param_manager.get_model_parameters(
-                "gpt-4", 
-                ModelType.CHAT,
-                temperature=0.7,
-                max_tokens=1500
-            ),
-            "logging": {"enabled": True, "log_level": "info"}
-        }
-    
+        # Per-instance getter caches; the name space is tiny and lookups
+        # happen per request
+        self._rag_cache: Dict[str, Dict[str, Any]] = {}
+        self._vec_cache: Dict[str, Dict[str, Any]] = {}
+        self._emb_cache: Dict[str, Dict[str, Any]] = {}
+        self._llm_cache: Dict[str, Dict[str, Any]] = {}
+
+    # Each config loads lazily on first access, so callers that never
+    # touch a section pay none of its I/O or parameter-manager work
+
+    @functools.cached_property
+    def rag_models(self) -> Dict[str, Any]:
+        """RAG model configuration, loaded on first access"""
+        config = self._load_config("rag_models_config.json")
+        # Resolve the facebook_rag index path at load time instead of
+        # rebuilding it on every get_rag_model call
+        facebook_rag = config.get("rag_models", {}).get("facebook_rag")
+        if facebook_rag is not None:
+            facebook_rag["index_path"] = str(
+                Path(__file__).parent / "indexes" / "facebook_dpr"
+                / facebook_rag.get("index_name", "wikipedia_2020")
+            )
+        return config
+
+    @functools.cached_property
+    def vector_db(self) -> Dict[str, Any]:
+        """Vector database configuration, loaded on first access"""
+        return self._load_config("vector_db_config.json")
+
+    # Section views resolved once so the getters skip the per-call
+    # vector_db.get probe and its empty-dict allocation on miss
+
+    @functools.cached_property
+    def _embedding_models(self) -> Dict[str, Any]:
+        return self.vector_db.get("embedding_models", {})
+
+    @functools.cached_property
+    def _llm_models(self) -> Dict[str, Any]:
+        return self.vector_db.get("llm_models", {})
+
+    @functools.cached_property
+    def _custom_rules(self) -> Dict[str, Any]:
+        return self.vector_db.get("custom_rules", {})
+
+    @functools.cached_property
+    def system_config(self) -> RAGSystemConfig:
+        """System configuration, copied from the shared template"""
+        return copy.deepcopy(_default_system_config_template())
+
     def _load_config(self, filename: str) -> Dict[str, Any]:
         """Load configuration from file"""
         try:
-            with open(self.config_dir / filename, 'r') as f:
-                return json.load(f)
+            path = (self.config_dir / filename).resolve()
+            # Deep-copy so per-instance mutations never leak into the
+            # shared parse cache
+            return copy.deepcopy(
+                _load_json_cached(str(path), path.stat().st_mtime_ns)
+            )
         except Exception as e:
             logger.error(f"Error loading config from {filename}: {str(e)}")
             raise
@@ -95,21 +179,21 @@ class RAGConfigManager:
         Returns:
             RAG model configuration
         """
+        cached = self._rag_cache.get(model_name)
+        if cached is not None:
+            return cached
+
         if model_name not in self.rag_models["rag_models"]:
             raise ValueError(f"RAG model {model_name} not found")
-            
+
         config = self.rag_models["rag_models"][model_name]
-        
-        # Special handling for Facebook RAG
+
+        # Special handling for Facebook RAG; index_path is already
+        # resolved at load time
         if model_name == "facebook_rag":
             config["vector_db_config"] = self.get_vector_db("facebook_dpr")
-            config["index_path"] = os.path.join(
-                os.path.dirname(__file__),
-                "indexes",
-                "facebook_dpr",
-                config.get("index_name", "wikipedia_2020")
-            )
-            
+
+        self._rag_cache[model_name] = config
         return config
     
     def get_vector_db(self, db_name: str) -> Dict[str, Any]:
@@ -122,9 +206,16 @@ class RAGConfigManager:
         Returns:
             Vector database configuration
         """
+        cached = self._vec_cache.get(db_name)
+        if cached is not None:
+            return cached
+
         if db_name not in self.vector_db["vector_databases"]:
             raise ValueError(f"Vector database {db_name} not found")
-        return self.vector_db["vector_databases"][db_name]
+
+        config = self.vector_db["vector_databases"][db_name]
+        self._vec_cache[db_name] = config
+        return config
     
     def get_embedding_model(self, model_name: str) -> Dict[str, Any]:
         """
@@ -136,15 +227,18 @@ class RAGConfigManager:
         Returns:
             Embedding model configuration
         """
-        models = self.vector_db.get("embedding_models", {})
-        if model_name not in models:
-            # Return default configuration
-            return {
-                "type": "OpenAI",
-                "description": "Default OpenAI embedding model",
-                "vector_size": 1536
-            }
-        return models[model_name]
+        cached = self._emb_cache.get(model_name)
+        if cached is not None:
+            return cached
+
+        config = self._embedding_models.get(model_name)
+        if config is None:
+            # Copy the shared default per miss so a caller mutating its
+            # result never poisons the module-level template
+            config = dict(_DEFAULT_EMBEDDING)
+
+        self._emb_cache[model_name] = config
+        return config
     
     def get_llm_config(self, model_name: str) -> Dict[str, Any]:
         """
@@ -156,10 +250,14 @@ class RAGConfigManager:
         Returns:
             Language model configuration
         """
-        models = self.vector_db.get("llm_models", {})
+        cached = self._llm_cache.get(model_name)
+        if cached is not None:
+            return cached
+
+        models = self._llm_models
         if model_name not in models:
             # Get default parameters from parameter manager
-            return {
+            config = {
                 "type": "OpenAI",
                 "description": "Default OpenAI language model",
                 **self.param_manager.get_model_parameters(
@@ -167,7 +265,11 @@ class RAGConfigManager:
                     ModelType.CHAT
                 )
             }
-        return models[model_name]
+        else:
+            config = models[model_name]
+
+        self._llm_cache[model_name] = config
+        return config
     
     def get_system_config(self) -> RAGSystemConfig:
         """
@@ -209,24 +311,38 @@ class RAGConfigManager:
         if logging_config:
             self.system_config["logging"].update(logging_config)
     
+    @functools.cached_property
+    def _compiled_rules(self) -> Dict[str, Optional[tuple]]:
+        """Custom rules parsed once into (field, model) assignments;
+        rules with unrecognized actions compile to None."""
+        compiled = {}
+        for rule_name, rule in self._custom_rules.items():
+            match = _RULE_RE.search(rule.get("action", ""))
+            if match:
+                model = match["model"]
+                field = (
+                    "embedding_model" if model.startswith("text-embedding")
+                    else "llm_model"
+                )
+                compiled[rule_name] = (field, model)
+            else:
+                compiled[rule_name] = None
+        return compiled
+
     def apply_custom_rule(self, rule_name: str) -> None:
         """
         Apply a custom configuration rule.
-        
+
         Args:
             rule_name: Name of the rule to apply
         """
-        rules = self.vector_db.get("custom_rules", {})
-        if rule_name not in rules:
+        if rule_name not in self._compiled_rules:
             raise ValueError(f"Custom rule {rule_name} not found")
-            
-        rule = rules[rule_name]
-        action = rule.get("action", "")
-        
-        if "Use text-embedding" in action:
-            self.system_config["embedding_model"] = action.split()[-1]
-        elif "Use gpt-" in action:
-            self.system_config["llm_model"] = action.split()[-1]
+
+        compiled = self._compiled_rules[rule_name]
+        if compiled:
+            field, model = compiled
+            self.system_config[field] = model
 
 # Example usage
 if __name__ == "__main__":
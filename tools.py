@@ -2,105 +2,444 @@
 Module containing tool implementations for web scraping and calendar integration.
 """
 from typing import Dict, Any, List, Optional
+import asyncio
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401 - C-backed parser, used by name below
+    _SOUP_PARSER = 'lxml'
+except ImportError:  # optional parser, ~10x faster than html.parser
+    _SOUP_PARSER = 'html.parser'
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional C HTML parser, far faster than bs4
+    LexborHTMLParser = None
+
 from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import logging
+import os
+import shelve
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # no flock on this platform; single-process cache only
+    fcntl = None
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Only these tags are ever read, so skip materializing the rest of the DOM
+_SCRAPE_STRAINER = SoupStrainer(['title', 'p', 'a'])
+
+def _build_http_session() -> requests.Session:
+    """Build the pooled session shared by every scraper instance."""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    })
+    # Widen the connection pool so concurrent scrapes reuse keep-alive
+    # connections instead of queueing on the default 10
+    adapter = HTTPAdapter(pool_connections=64, pool_maxsize=64)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# Process-wide session: TCP/TLS connections persist across scraper
+# instances instead of one handshake set per instance
+_HTTP_SESSION = _build_http_session()
+
+# On-disk scrape cache shared across processes: a restarted server
+# reuses earlier (etag, last_modified, result) entries instead of
+# starting cold. The threading lock serializes threads and an flock on
+# the sidecar lockfile serializes processes, since neither shelve nor
+# its dbm backend does any locking of its own
+_DISK_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'agenticai', 'scrape_cache'
+)
+_disk_cache = None
+_disk_cache_lock = threading.Lock()
+_disk_cache_lock_fd = None
+_disk_cache_unusable = False
+
+@contextmanager
+def _disk_cache_locked(exclusive: bool = False):
+    """Yield the shelve for one cache access, or None when unusable.
+
+    With fcntl the shelve is reopened per access under a shared (read)
+    or exclusive (write) flock: a dbm handle caches index state in
+    memory, so a long-lived handle would silently lose writes made by
+    other processes. Without fcntl one long-lived handle under the
+    thread lock keeps the old single-process behavior.
+    """
+    global _disk_cache, _disk_cache_lock_fd, _disk_cache_unusable
+    with _disk_cache_lock:
+        if _disk_cache_unusable:
+            yield None
+            return
+        try:
+            if fcntl is None:
+                if _disk_cache is None:
+                    os.makedirs(os.path.dirname(_DISK_CACHE_PATH), exist_ok=True)
+                    _disk_cache = shelve.open(_DISK_CACHE_PATH)
+                yield _disk_cache
+                return
+            if _disk_cache_lock_fd is None:
+                os.makedirs(os.path.dirname(_DISK_CACHE_PATH), exist_ok=True)
+                _disk_cache_lock_fd = os.open(
+                    _DISK_CACHE_PATH + '.lock', os.O_CREAT | os.O_RDWR
+                )
+        except Exception as e:
+            logger.warning(f"Scrape disk cache unavailable: {str(e)}")
+            _disk_cache_unusable = True
+            yield None
+            return
+
+        fcntl.flock(
+            _disk_cache_lock_fd,
+            fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        )
+        try:
+            # Readers open the dbm read-only; a missing file is just a
+            # cold cache, not an error
+            db = shelve.open(_DISK_CACHE_PATH, flag='c' if exclusive else 'r')
+        except Exception:
+            fcntl.flock(_disk_cache_lock_fd, fcntl.LOCK_UN)
+            yield None
+            return
+        try:
+            yield db
+        finally:
+            db.close()
+            fcntl.flock(_disk_cache_lock_fd, fcntl.LOCK_UN)
+
+# (iso_value, monotonic_stamp) for the shared timestamp below
+_ts_cache = ('', 0.0)
+
+def _batch_ts() -> str:
+    """Current UTC ISO timestamp, reused within a one-second window.
+
+    Batched scrapes and calendar fetches stamp effectively simultaneous
+    results, so one render per second replaces one per call.
+    """
+    global _ts_cache
+    value, stamped = _ts_cache
+    now = time.monotonic()
+    if not value or now - stamped >= 1.0:
+        value = datetime.now(timezone.utc).isoformat()
+        _ts_cache = (value, now)
+    return value
+
+def _extract_content(body: bytes) -> tuple:
+    """Pull title, paragraph text, and the first ten links from a page.
+
+    Uses selectolax's Lexbor parser when installed - its C node model
+    skips BeautifulSoup's per-tag Python objects - and falls back to the
+    strained BeautifulSoup walk otherwise.
+    """
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(body)
+        title_node = tree.css_first('title')
+        title = title_node.text() if title_node else ''
+        text = ' '.join(p.text() for p in tree.css('p'))
+        links = [a.attributes.get('href') for a in tree.css('a[href]')[:10]]
+        return title, text, links
+
+    soup = BeautifulSoup(body, _SOUP_PARSER, parse_only=_SCRAPE_STRAINER)
+
+    # Extract title, text, and links in one tree walk instead of a
+    # separate traversal per field
+    title = ''
+    texts = []
+    links = []
+    for tag in soup.descendants:
+        name = getattr(tag, 'name', None)
+        if name is None:
+            continue
+        if name == 'p':
+            texts.append(tag.get_text())
+        elif name == 'a':
+            if len(links) < 10 and tag.has_attr('href'):
+                links.append(tag['href'])
+        elif name == 'title' and not title:
+            title = tag.string or ''
+
+    return title, ' '.join(texts), links
+
+@dataclass(slots=True)
+class ScrapeResult:
+    """Result of one website scrape; slotted to keep per-page
+    allocations to a single fixed-layout object instead of nested dicts."""
+    status: str
+    title: str = ''
+    text: str = ''
+    links: List[str] = field(default_factory=list)
+    url: str = ''
+    timestamp: str = ''
+    status_code: int = 0
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Render the legacy nested-dict shape for tool-call consumers."""
+        if self.status != 'success':
+            return {'status': self.status, 'error': self.error}
+        return {
+            'status': 'success',
+            'content': {
+                'title': self.title,
+                'text': self.text,
+                'links': self.links,
+                'metadata': {
+                    'url': self.url,
+                    'timestamp': self.timestamp,
+                    'status_code': self.status_code
+                }
+            }
+        }
+
+@dataclass(slots=True)
+class CalendarEvent:
+    """One formatted calendar event."""
+    summary: str
+    start: str
+    description: str = ''
+    location: str = ''
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'summary': self.summary,
+            'start': self.start,
+            'description': self.description,
+            'location': self.location
+        }
+
+@dataclass(slots=True)
+class CalendarResult:
+    """Result of one calendar fetch."""
+    status: str
+    events: List[CalendarEvent] = field(default_factory=list)
+    calendar_id: str = ''
+    timestamp: str = ''
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Render the legacy nested-dict shape for tool-call consumers."""
+        if self.status != 'success':
+            return {'status': self.status, 'error': self.error}
+        return {
+            'status': 'success',
+            'events': [event.to_dict() for event in self.events],
+            'metadata': {
+                'calendar_id': self.calendar_id,
+                'timestamp': self.timestamp,
+                'event_count': len(self.events)
+            }
+        }
+
 class WebScraper:
     """Class for handling web scraping operations."""
-    
+
+    # Read at most this much of a response body; extraction only needs
+    # the leading content and unbounded pages would blow memory
+    MAX_BYTES = 4 * 1024 * 1024
+
+    # Revalidation cache capacity (entries)
+    PAGE_CACHE_SIZE = 256
+
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        
-    def scrape_website(self, url: str, max_depth: int = 2) -> Dict[str, Any]:
+        self.session = _HTTP_SESSION
+        # url -> (etag, last_modified, result); LRU via OrderedDict so
+        # hot pages revalidate with a 304 instead of refetch + reparse.
+        # scrape_many drives scrape_website from many threads, so every
+        # get/insert/move_to_end/popitem sequence holds the lock
+        self._page_cache: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._page_cache_lock = threading.Lock()
+
+    def scrape_many(self, urls: List[str], max_workers: int = 16) -> List[ScrapeResult]:
+        """
+        Scrape several websites concurrently over the shared session.
+
+        Args:
+            urls: Website URLs to scrape
+            max_workers: Upper bound on concurrent fetches
+
+        Returns:
+            List of scrape results in input order
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.scrape_website, urls))
+
+    async def ascrape_website(self, url: str, max_depth: int = 2) -> ScrapeResult:
+        """Scrape one website without blocking the event loop."""
+        return await asyncio.to_thread(self.scrape_website, url, max_depth)
+
+    async def ascrape_many(self, urls: List[str]) -> List[ScrapeResult]:
+        """Scrape several websites concurrently from async callers."""
+        return await asyncio.gather(
+            *[self.ascrape_website(url) for url in urls]
+        )
+
+    def scrape_website(self, url: str, max_depth: int = 2) -> ScrapeResult:
         """
         Scrape content from a website with specified depth.
-        
+
         Args:
             url: Website URL to scrape
             max_depth: Maximum depth for following links
-            
+
         Returns:
-            Dictionary containing scraped content and metadata
+            ScrapeResult with the scraped content and metadata
         """
         try:
             logger.info(f"Starting scrape of {url} with max_depth {max_depth}")
-            response = self.session.get(url)
+            # Offer the validators from any cached copy so an unchanged
+            # page answers 304 and skips the body transfer and reparse;
+            # fall back to the cross-process disk cache on a memory miss
+            with self._page_cache_lock:
+                cached = self._page_cache.get(url)
+            if cached is None:
+                with _disk_cache_locked() as disk:
+                    try:
+                        cached = disk.get(url) if disk is not None else None
+                    except Exception as e:
+                        # A corrupt or backend-incompatible entry is just
+                        # a cache miss, not a scrape failure
+                        logger.warning(f"Scrape disk cache read failed: {str(e)}")
+                        cached = None
+                if cached is not None:
+                    with self._page_cache_lock:
+                        self._page_cache[url] = cached
+            headers = {}
+            if cached:
+                etag, last_modified, _ = cached
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
+
+            # Stream the body and stop reading at the size cap instead
+            # of buffering arbitrarily large pages
+            response = self.session.get(
+                url, stream=True, timeout=10, headers=headers or None
+            )
+            if cached and response.status_code == 304:
+                with self._page_cache_lock:
+                    try:
+                        self._page_cache.move_to_end(url)
+                    except KeyError:
+                        # Evicted by another thread since the lookup; the
+                        # revalidated parse is still in hand
+                        self._page_cache[url] = cached
+                return cached[2]
             response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Extract main content
-            content = {
-                'title': soup.title.string if soup.title else '',
-                'text': ' '.join([p.get_text() for p in soup.find_all('p')]),
-                'links': [a['href'] for a in soup.find_all('a', href=True)][:10],
-                'metadata': {
-                    'url': url,
-                    'timestamp': datetime.now().isoformat(),
-                    'status_code': response.status_code
-                }
-            }
-            
-            return {
-                'status': 'success',
-                'content': content
-            }
-            
+            body = response.raw.read(self.MAX_BYTES, decode_content=True)
+
+            title, text, links = _extract_content(body)
+
+            result = ScrapeResult(
+                status='success',
+                title=title,
+                text=text,
+                links=links,
+                url=url,
+                timestamp=_batch_ts(),
+                status_code=response.status_code
+            )
+
+            # Cache only pages that advertise validators
+            etag = response.headers.get('ETag', '')
+            last_modified = response.headers.get('Last-Modified', '')
+            if etag or last_modified:
+                entry = (etag, last_modified, result)
+                with self._page_cache_lock:
+                    self._page_cache[url] = entry
+                    self._page_cache.move_to_end(url)
+                    if len(self._page_cache) > self.PAGE_CACHE_SIZE:
+                        self._page_cache.popitem(last=False)
+                with _disk_cache_locked(exclusive=True) as disk:
+                    if disk is not None:
+                        try:
+                            disk[url] = entry
+                        except Exception as e:
+                            # The fetch succeeded; a failed cache write
+                            # is best-effort, never a scrape failure
+                            logger.warning(
+                                f"Scrape disk cache write failed: {str(e)}"
+                            )
+
+            return result
+
         except Exception as e:
             logger.error(f"Error scraping {url}: {str(e)}")
-            return {
-                'status': 'error',
-                'error': str(e)
-            }
+            return ScrapeResult(status='error', url=url, error=str(e))
+
+# Credentials and the Discovery service are process-wide: every
+# CalendarTool shares one token parse and one service construction
+_calendar_credentials = None
+_calendar_service = None
+_calendar_service_lock = threading.Lock()
 
 class CalendarTool:
     """Class for handling Google Calendar operations."""
-    
+
     def __init__(self):
         self.credentials = None
         self.service = None
-        
+
     def _initialize_service(self):
         """Initialize the Google Calendar service."""
-        if not self.service:
-            try:
-                self.credentials = Credentials.from_authorized_user_file(
-                    'credentials.json', ['https://www.googleapis.com/auth/calendar.readonly']
-                )
-                self.service = build('calendar', 'v3', credentials=self.credentials)
-            except Exception as e:
-                logger.error(f"Error initializing Calendar service: {str(e)}")
-                raise
+        global _calendar_credentials, _calendar_service
+        if self.service:
+            return
+        if _calendar_service is None:
+            with _calendar_service_lock:
+                if _calendar_service is None:
+                    try:
+                        _calendar_credentials = Credentials.from_authorized_user_file(
+                            'credentials.json', ['https://www.googleapis.com/auth/calendar.readonly']
+                        )
+                        # static_discovery uses the bundled discovery
+                        # doc, skipping the HTTPS fetch at build time
+                        _calendar_service = build(
+                            'calendar', 'v3',
+                            credentials=_calendar_credentials,
+                            static_discovery=True
+                        )
+                    except Exception as e:
+                        logger.error(f"Error initializing Calendar service: {str(e)}")
+                        raise
+        self.credentials = _calendar_credentials
+        self.service = _calendar_service
                 
     def fetch_calendar_events(
         self,
         calendar_id: str = 'primary',
         max_events: int = 5
-    ) -> Dict[str, Any]:
+    ) -> CalendarResult:
         """
         Fetch events from Google Calendar.
-        
+
         Args:
             calendar_id: ID of the calendar to fetch events from
             max_events: Maximum number of events to fetch
-            
+
         Returns:
-            Dictionary containing calendar events and metadata
+            CalendarResult with the fetched events and metadata
         """
         try:
             self._initialize_service()
             
-            now = datetime.utcnow().isoformat() + 'Z'
+            now = _batch_ts()
             events_result = self.service.events().list(
                 calendarId=calendar_id,
                 timeMin=now,
@@ -110,46 +449,148 @@ class CalendarTool:
             ).execute()
             
             events = events_result.get('items', [])
-            
-            formatted_events = []
-            for event in events:
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                formatted_events.append({
-                    'summary': event.get('summary', 'No title'),
-                    'start': start,
-                    'description': event.get('description', ''),
-                    'location': event.get('location', '')
-                })
-                
-            return {
-                'status': 'success',
-                'events': formatted_events,
-                'metadata': {
-                    'calendar_id': calendar_id,
-                    'timestamp': datetime.now().isoformat(),
-                    'event_count': len(formatted_events)
-                }
-            }
-            
+
+            return CalendarResult(
+                status='success',
+                events=self._format_events(events),
+                calendar_id=calendar_id,
+                timestamp=_batch_ts()
+            )
+
         except Exception as e:
             logger.error(f"Error fetching calendar events: {str(e)}")
+            return CalendarResult(
+                status='error', calendar_id=calendar_id, error=str(e)
+            )
+
+    @staticmethod
+    def _format_events(events: List[Dict[str, Any]]) -> List[CalendarEvent]:
+        """Format raw API events into the fields callers consume."""
+        formatted_events = []
+        for event in events:
+            start = event['start'].get('dateTime', event['start'].get('date'))
+            formatted_events.append(CalendarEvent(
+                summary=event.get('summary', 'No title'),
+                start=start,
+                description=event.get('description', ''),
+                location=event.get('location', '')
+            ))
+        return formatted_events
+
+    def fetch_calendar_events_batch(
+        self,
+        calendar_ids: List[str],
+        max_events: int = 5
+    ) -> Dict[str, CalendarResult]:
+        """
+        Fetch events from several calendars in one batched HTTP request.
+
+        Args:
+            calendar_ids: IDs of the calendars to fetch events from
+            max_events: Maximum number of events to fetch per calendar
+
+        Returns:
+            Dictionary mapping calendar ID to its events result
+        """
+        try:
+            self._initialize_service()
+
+            now = _batch_ts()
+            timestamp = now
+            results: Dict[str, CalendarResult] = {}
+
+            def _collect(request_id, response, exception):
+                if exception is not None:
+                    results[request_id] = CalendarResult(
+                        status='error',
+                        calendar_id=request_id,
+                        error=str(exception)
+                    )
+                    return
+                results[request_id] = CalendarResult(
+                    status='success',
+                    events=self._format_events(response.get('items', [])),
+                    calendar_id=request_id,
+                    timestamp=timestamp
+                )
+
+            # One multipart round-trip replaces a request per calendar
+            batch = self.service.new_batch_http_request()
+            for calendar_id in calendar_ids:
+                batch.add(
+                    self.service.events().list(
+                        calendarId=calendar_id,
+                        timeMin=now,
+                        maxResults=max_events,
+                        singleEvents=True,
+                        orderBy='startTime'
+                    ),
+                    callback=_collect,
+                    request_id=calendar_id
+                )
+            batch.execute()
+
+            return results
+
+        except Exception as e:
+            logger.error(f"Error batch-fetching calendar events: {str(e)}")
             return {
-                'status': 'error',
-                'error': str(e)
+                calendar_id: CalendarResult(
+                    status='error', calendar_id=calendar_id, error=str(e)
+                )
+                for calendar_id in calendar_ids
             }
 
+    async def afetch_calendar_events(
+        self,
+        calendar_id: str = 'primary',
+        max_events: int = 5
+    ) -> CalendarResult:
+        """Fetch calendar events without blocking the event loop."""
+        return await asyncio.to_thread(
+            self.fetch_calendar_events, calendar_id, max_events
+        )
+
 # Initialize global tool instances
 web_scraper = WebScraper()
 calendar_tool = CalendarTool()
 
-# Expose tool functions
+# Expose tool functions; the wrappers render the slotted results back
+# into the dict shape the tool-call interface expects
 def scrape_website(url: str, max_depth: int = 2) -> Dict[str, Any]:
     """Wrapper function for web scraping."""
-    return web_scraper.scrape_website(url, max_depth)
+    return web_scraper.scrape_website(url, max_depth).to_dict()
+
+def scrape_websites(urls: List[str], max_workers: int = 16) -> List[Dict[str, Any]]:
+    """Wrapper function for concurrent web scraping."""
+    return [result.to_dict() for result in web_scraper.scrape_many(urls, max_workers)]
 
 def fetch_calendar_events(
     calendar_id: str = 'primary',
     max_events: int = 5
 ) -> Dict[str, Any]:
     """Wrapper function for calendar events."""
-    return calendar_tool.fetch_calendar_events(calendar_id, max_events)
+    return calendar_tool.fetch_calendar_events(calendar_id, max_events).to_dict()
+
+def fetch_calendar_events_batch(
+    calendar_ids: List[str],
+    max_events: int = 5
+) -> Dict[str, Dict[str, Any]]:
+    """Wrapper function for batched calendar events."""
+    results = calendar_tool.fetch_calendar_events_batch(calendar_ids, max_events)
+    return {
+        calendar_id: result.to_dict()
+        for calendar_id, result in results.items()
+    }
+
+async def ascrape_website(url: str, max_depth: int = 2) -> Dict[str, Any]:
+    """Async wrapper for web scraping."""
+    return (await web_scraper.ascrape_website(url, max_depth)).to_dict()
+
+async def afetch_calendar_events(
+    calendar_id: str = 'primary',
+    max_events: int = 5
+) -> Dict[str, Any]:
+    """Async wrapper for calendar events."""
+    result = await calendar_tool.afetch_calendar_events(calendar_id, max_events)
+    return result.to_dict()